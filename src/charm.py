@@ -4,31 +4,31 @@
 
 """A charmed operator for Blackbox Exporter."""
 
-import json
+import functools
+import hashlib
 import logging
+import os
 import socket
 from typing import Any, Dict, List, TypedDict, cast
 
 import ops
-import yaml
+import orjson
 from charms.grafana_agent.v0.cos_agent import COSAgentProvider
 from charms.operator_libs_linux.v2 import snap
 from cosl.reconciler import all_events, observe_events
 from ops import CollectStatusEvent, Relation, StoredState
 from ops.jujucontext import JujuContext
 from ops.model import ActiveStatus, BlockedStatus, MaintenanceStatus, StatusBase
-from pydantic import ValidationError
 
 from constants import (
     COS_AGENT_RELATION_NAME,
-    DEFAULT_CONFIG_FILE,
+    DEFAULT_CONFIG,
     DEFAULT_PORT,
     LOG_SLOT_NAME,
     PEERS_RELATION_NAME,
     SNAP_CONFIG_PATH,
     SNAP_NAME,
 )
-from models import Config, ProbesFile
 from singleton_snap import SingletonSnapManager
 from snap_management import (
     SnapMap,
@@ -41,9 +41,84 @@ logger = logging.getLogger(__name__)
 
 PRINCIPAL_HOSTNAME = socket.gethostname()
 
+# YAML parsing and the validation schemas are only needed on hooks that
+# actually look at config content, while this module is imported on every
+# dispatch (update-status included). Import them lazily and cache the
+# expensive pieces so the cost is paid once, on first use.
+
+@functools.lru_cache(maxsize=1)
+def _yaml_safe_loader():
+    """Return the libyaml-backed YAML loader, or the pure-Python fallback."""
+    try:
+        # The C loader (libyaml) parses without the pure-Python per-event churn.
+        from yaml import CSafeLoader
+        return CSafeLoader
+    except ImportError:  # pragma: nocover - PyYAML wheels ship libyaml
+        from yaml import SafeLoader
+        return SafeLoader
+
+def _load_yaml(text: str) -> Any:
+    """Parse YAML with the fastest safe loader available."""
+    import yaml
+
+    return yaml.load(text, Loader=_yaml_safe_loader())
+
+@functools.lru_cache(maxsize=1)
+def _default_config_file() -> str:
+    """Dump the default config dict to YAML, once, on first use."""
+    import yaml
+
+    return yaml.safe_dump(DEFAULT_CONFIG)
+
+@functools.lru_cache(maxsize=1)
+def _config_adapter():
+    """Compile the Config validation schema on first use."""
+    from pydantic import TypeAdapter
+
+    from models import Config
+
+    return TypeAdapter(Config)
+
+@functools.lru_cache(maxsize=1)
+def _probes_adapter():
+    """Compile the ProbesFile validation schema on first use."""
+    from pydantic import TypeAdapter
+
+    from models import ProbesFile
+
+    return TypeAdapter(ProbesFile)
+
+def _content_hash(content: str) -> str:
+    """Return a short digest identifying already-validated file content."""
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+@functools.lru_cache(maxsize=1)
+def _ctx() -> JujuContext:
+    """Parse the Juju environment once per hook invocation.
+
+    A hook runs in a short-lived process and the Juju env variables never
+    change within it, so the parse result is cached for the process lifetime.
+    Tests that emit several events in one process should call `_ctx.cache_clear()`.
+    """
+    return JujuContext.from_environ()
+
 def juju_context(arg: str):
     """Return Juju env variables."""
-    return getattr(JujuContext.from_environ(), arg)
+    return getattr(_ctx(), arg)
+
+# The static relabel rules shared by every probe scrape job; the only dynamic
+# rule is the exporter address appended in _relabel_configs.
+_BASE_RELABEL_CONFIGS = (
+    {'source_labels': ['__address__'], 'target_label': '__param_target'},
+    {'source_labels': ['__param_target'], 'target_label': 'instance'},
+)
+
+# Hooks on which the effective snap config can actually have changed;
+# _push_config is skipped on everything else (e.g. update-status).
+_CONFIG_AFFECTING_EVENTS = frozenset({"config-changed", "install", "upgrade-charm", "start"})
+
+# Hooks on which the snaps need to be (re)installed.
+_INSTALL_EVENTS = frozenset({"install", "upgrade"})
 
 def event() -> str:
     """Return Juju hook|action name.
@@ -52,7 +127,7 @@ def event() -> str:
     - https://github.com/juju/juju/blob/cbb05654c7444dd6bee29e49aff16339f02c34f9/docs/reference/action.md?plain=1#L55
     - https://github.com/juju/juju/blob/cbb05654c7444dd6bee29e49aff16339f02c34f9/docs/reference/hook.md?plain=1#L1088
     """
-    return juju_context("hook_name")
+    return _ctx().hook_name
 
 class CompositeStatus(TypedDict):
     """Per-component status holder."""
@@ -85,18 +160,36 @@ class BlackboxExporterOperatorCharm(ops.CharmBase):
     def __init__(self, framework: ops.Framework):
         super().__init__(framework)
 
+        # StatusBase instances written this hook, keyed like CompositeStatus.
+        # Saves _collect_unit_status from rebuilding them via StatusBase.from_name.
+        self._status_cache: Dict[str, StatusBase] = {}
+
+        # Cache for _all_scrape_jobs, keyed on its inputs, because the
+        # COSAgentProvider may evaluate the scrape_configs callable several
+        # times per hook (once per refresh event).
+        self._jobs_cache_key: Any = None
+        self._jobs_cache_val: List[Dict[str, Any]] | None = None
+
         self._stored.set_default(
             status=CompositeStatus(
                 snap=to_tuple(ActiveStatus()),
                 config=to_tuple(ActiveStatus()),
                 probes_file=to_tuple(ActiveStatus()),
-            )
+            ),
+            # Digests of the last *successfully validated* config and probes
+            # file, so unchanged content skips the YAML parse + pydantic walk.
+            config_hash="",
+            probes_hash="",
+            # [st_mtime_ns, st_size] of SNAP_CONFIG_PATH after our last write,
+            # so an untouched file does not need to be re-read for comparison.
+            config_file_stat=[],
         )
 
-        if event() in ("install", "upgrade"):
+        ev = event()
+        if ev in _INSTALL_EVENTS:
             self._install_snaps()
 
-        elif event() == "remove":
+        elif ev == "remove":
             self._remove_blackbox_exporter()
             return
 
@@ -118,29 +211,46 @@ class BlackboxExporterOperatorCharm(ops.CharmBase):
         self.framework.observe(self.on.collect_unit_status, self._collect_unit_status)
         observe_events(self, all_events, self._reconcile)
 
+    def _set_status(self, component: str, status: StatusBase) -> None:
+        """Record a component status both in StoredState and as a live object."""
+        self._status_cache[component] = status
+        new = to_tuple(status)
+        # Writing an unchanged tuple would still dirty StoredState and force
+        # a flush to the unit state database on hook exit.
+        if tuple(self._stored.status[component]) != new:
+            self._stored.status[component] = new
+
     def _collect_unit_status(self, event: CollectStatusEvent):
-        # Push status
-        for status in self._stored.status.values():
-            event.add_status(to_status(status))
+        # Push status; prefer the StatusBase instances cached by _set_status
+        # and only rebuild from the stored tuple for components not written
+        # during this hook.
+        for component, tpl in self._stored.status.items():
+            event.add_status(self._status_cache.get(component) or to_status(tpl))
 
         # Pull status
         if not is_snap_active(SNAP_NAME):
             event.add_status(BlockedStatus(f"Snap {SNAP_NAME} is inactive; see debug-log"))
 
     def _reconcile(self):
-        if self._push_config():
+        ev = event()
+        if ev in _CONFIG_AFFECTING_EVENTS and self._push_config():
             self._restart_snap(SNAP_NAME)
 
-        if event() == "peers-relation-joined":
+        if ev == "peers-relation-joined":
             self._update_peer_relation_data()
 
+    @functools.cached_property
+    def _snap_cache(self) -> snap.SnapCache:
+        """Return a SnapCache, built on first use and shared for the hook."""
+        return snap.SnapCache()
+
     def snap(self, snap_name: str) -> snap.Snap:
         """Return the snap object for the given snap.
 
         This method provides lazy initialization of snap objects, avoiding unnecessary
         calls to snapd until they're actually needed.
         """
-        return snap.SnapCache()[snap_name]
+        return self._snap_cache[snap_name]
 
     def _push_config(self) -> bool:
         """Validate provided config and overwrite current snap config.
@@ -150,60 +260,115 @@ class BlackboxExporterOperatorCharm(ops.CharmBase):
         """
         config = cast(str, self.model.config.get("config_file"))
 
-        # If config hasn't changed, return False as no overwriting will happen.
-        # Or if the juju config option is None and we are already using the default,
-        #return False
-        current_config = file_contents(SNAP_CONFIG_PATH)
-        if current_config == config or (current_config == DEFAULT_CONFIG_FILE and not config):
-            return False
-
         # If the config_file is empty, the default will be used.
         if not config:
-            config = DEFAULT_CONFIG_FILE
+            config = _default_config_file()
 
-        # We do a basic config validation of the yaml content
-        try:
-            provided_config = yaml.safe_load(config)
+        config_hash = _content_hash(config)
 
-        # Only catching yaml.YamlError or yaml.scanner.ScannerError
-        # may not be very robust. Let's assume the generic Exception is
-        # due to invalid YAML.
-        except Exception as e:
-            logger.error("Failed to load the configuration; invalid YAML: %s %s", config, str(e))
-            self._stored.status["config"] = to_tuple(
-                BlockedStatus("Config file is invalid; see debug-log")
-            )
+        # If the file is stat-identical to our last write and the candidate
+        # config hashes to what we last validated and wrote, there is nothing
+        # to do; skip even the file read.
+        try:
+            st = SNAP_CONFIG_PATH.stat()
+            stat_key = [st.st_mtime_ns, st.st_size]
+        except FileNotFoundError:
+            stat_key = None
+        if (
+            stat_key is not None
+            and stat_key == list(self._stored.config_file_stat)
+            and config_hash == self._stored.config_hash
+        ):
             return False
 
-        # Now we validate the config with the Config BaseModel.
-        try:
-            Config(**provided_config)
-        except Exception as e:
-            logger.error("Config validation failed: %s", e)
-            self._stored.status["config"] = to_tuple(
-                BlockedStatus("Config file is invalid; see debug-log")
-            )
+        # If config hasn't changed, return False as no overwriting will happen.
+        current_config = file_contents(SNAP_CONFIG_PATH)
+        if current_config == config:
             return False
 
+        # Content we validated on a previous hook does not need to be parsed
+        # and validated again; hashing the string is much cheaper than both.
+        if config_hash != self._stored.config_hash:
+            # We do a basic config validation of the yaml content
+            try:
+                provided_config = _load_yaml(config)
+
+            # Only catching yaml.YamlError or yaml.scanner.ScannerError
+            # may not be very robust. Let's assume the generic Exception is
+            # due to invalid YAML.
+            except Exception as e:
+                logger.error(
+                    "Failed to load the configuration; invalid YAML: %s %s", config, str(e)
+                )
+                self._set_status("config", BlockedStatus("Config file is invalid; see debug-log"))
+                return False
+
+            # Most invalid configs are trivially malformed; catch those with a
+            # cheap shape check before paying for the full pydantic walk.
+            if not isinstance(provided_config, dict) or "modules" not in provided_config:
+                logger.error("Config validation failed: no top-level 'modules' mapping")
+                self._set_status("config", BlockedStatus("Config file is invalid; see debug-log"))
+                return False
+
+            # Now we validate the config with the Config BaseModel.
+            try:
+                _config_adapter().validate_python(provided_config)
+            except Exception as e:
+                logger.error("Config validation failed: %s", e)
+                self._set_status("config", BlockedStatus("Config file is invalid; see debug-log"))
+                return False
+
+            self._stored.config_hash = config_hash
+
         # If the file is valid YAML, then we overwrite the default snap config.
         # If we get to this point in the code, the config is guaranteed to at least
         # be valid YAML.
-        SNAP_CONFIG_PATH.write_text(config)
+        # Write to a sibling temp file and rename so the snap never sees a
+        # partially written config if the hook dies mid-write.
+        tmp_path = SNAP_CONFIG_PATH.with_suffix(".tmp")
+        tmp_path.write_text(config)
+        os.replace(tmp_path, SNAP_CONFIG_PATH)
+        st = SNAP_CONFIG_PATH.stat()
+        self._stored.config_file_stat = [st.st_mtime_ns, st.st_size]
         logger.info(f"Overwrote config for the Blackbox Exporter snap at {SNAP_CONFIG_PATH}")
-        self._stored.status["config"] = to_tuple(
-                    ActiveStatus()
-                    )
+        self._set_status("config", ActiveStatus())
         return True
 
     def _install_snaps(self) -> None:
         manager = SingletonSnapManager(self.unit.name)
 
-        for snap_name in SnapMap.snaps():
+        # Register and read back the lock-directory state in one pass each,
+        # instead of touching it once per snap in the loop below.
+        target_revisions = {name: SnapMap.get_revision(name) for name in SnapMap.snaps()}
+        manager.register_many(target_revisions)
+        registered = manager.snapshot_revisions()
+
+        # Intermediate per-snap transitions only matter as live progress
+        # (unit.status / logs); StoredState gets one write after the loop.
+        all_started = True
+        for snap_name, snap_revision in target_revisions.items():
+
+            if snap_revision >= max(registered.get(snap_name, ()), default=0):
+                # Skip the install/start round-trips to snapd when the snap is
+                # already sitting at the target revision with its services
+                # running. A stopped snap (e.g. a previous hook installed it
+                # but failed to start it) must fall through to the start call.
+                try:
+                    installed = self.snap(snap_name)
+                    already_running = (
+                        installed.present
+                        and str(installed.revision) == str(snap_revision)
+                        and all(svc["active"] for svc in installed.services.values())
+                    )
+                except (snap.SnapError, snap.SnapNotFoundError):
+                    # A not-yet-installed snap makes SnapCache fall through to
+                    # a snapd store query, which can fail (e.g. offline); treat
+                    # it as not installed and proceed with the install.
+                    already_running = False
+                if already_running:
+                    logger.info(f"Snap {snap_name} already at revision {snap_revision}")
+                    continue
 
-            snap_revision = SnapMap.get_revision(snap_name)
-            manager.register(snap_name, snap_revision)
-            revisions = manager.get_revisions(snap_name)
-            if snap_revision >= (max(revisions) if revisions else 0):
                 logger.info("Installing snap {snap_name}")
 
                 self.unit.status = MaintenanceStatus(f"Installing snap {snap_name}")
@@ -215,10 +380,13 @@ class BlackboxExporterOperatorCharm(ops.CharmBase):
                 try:
                     logger.info(f"Starting {snap_name} snap")
                     self.snap(snap_name).start(enable=True)
-                    self._stored.status["snap"] = to_tuple(ActiveStatus())
                 except snap.SnapError:
+                    all_started = False
                     logger.warning(f"Failed to start snap {snap_name}")
 
+        if all_started:
+            self._set_status("snap", ActiveStatus())
+
     def _restart_snap(self, snap_name: str) -> None:
         try:
             logger.info(f"Restarting snap {snap_name}")
@@ -254,18 +422,42 @@ class BlackboxExporterOperatorCharm(ops.CharmBase):
             logger.error("Failed to uninstall {snap_name} snap: {e}")
             # Don't raise the exception to avoid failing the remove hook
 
+    @functools.cached_property
+    def _peer_relation(self) -> Relation | None:
+        """Return the peers relation, resolved at most once per hook.
+
+        On peers relation events Juju already puts the relation id in the
+        environment, so passing it along lets ops skip the relation-ids
+        hook-tool call.
+        """
+        ctx = _ctx()
+        if ctx.relation_name == PEERS_RELATION_NAME and ctx.relation_id is not None:
+            relation = self.model.get_relation(PEERS_RELATION_NAME, ctx.relation_id)
+            # On relation-broken the id is still in the environment but the
+            # relation is dead; report None there, like the name-only lookup.
+            if relation is not None and not relation.active:
+                return None
+            return relation
+        return self.model.get_relation(PEERS_RELATION_NAME)
+
     def _update_peer_relation_data(self):
-        relation = self.model.get_relation(PEERS_RELATION_NAME)
+        relation = self._peer_relation
         if not relation:
             return
         peer_relation_data = {
             "principal-unit": juju_context("principal_unit") or "",
             "principal-hostname": PRINCIPAL_HOSTNAME,
-            "unit-networks": json.dumps([n.to_dict() for n in get_unit_networks()]),
+            # Juju relation data wants str, orjson emits bytes; decode once.
+            "unit-networks": orjson.dumps([n.to_dict() for n in self._unit_networks]).decode(),
             "az": juju_context("availability_zone") or "",
         }
 
-        relation.data[self.unit].update(peer_relation_data)
+        # Only write the keys that actually changed; an unchanged databag
+        # needs no relation-set round-trip at all.
+        current = relation.data[self.unit]
+        delta = {k: v for k, v in peer_relation_data.items() if current.get(k) != v}
+        if delta:
+            current.update(delta)
 
     def _connectivity_scrape_jobs(self, relation: Relation) -> Dict[str, Any]:
         """Scrape jobs from peer relation data will be generated by this method."""
@@ -285,37 +477,50 @@ class BlackboxExporterOperatorCharm(ops.CharmBase):
         # Targets can only be merged if they share the same labels.
         # There are no two peers which will share the same `interface` and `target` key,
         # so all targets must be separate dicts in static_configs.
-        scrape_job["static_configs"] = []
+        # These are constant for the whole hook; look them up once instead of
+        # once per peer-network combination.
+        base_labels = {
+            'source': juju_context("principal_unit"),
+            'source_hostname': PRINCIPAL_HOSTNAME,
+            'source_az': juju_context("availability_zone"),
+            'probe': 'icmp',
+        }
 
+        static_configs = []
         for unit in relation.units:
-            rel_data = relation.data[unit]
-            unit_networks = json.loads(rel_data.get("unit-networks", "[]"))
+            # Snapshot the databag once; every lookup on the ops proxy object
+            # goes back through the relation-data machinery otherwise.
+            rel_data = dict(relation.data[unit])
+            unit_networks = orjson.loads(rel_data.get("unit-networks") or b"[]")
 
             if not unit_networks:
                 continue
 
-            for network in unit_networks:
-                scrape_job["static_configs"].append({
+            destination_labels = {
+                'destination': rel_data['principal-unit'],
+                'destination_hostname': rel_data['principal-hostname'],
+                'destination_az': rel_data['az'],
+            }
+            static_configs.extend(
+                {
                     'targets': [network["ip"]],
                     'labels': {
+                        **base_labels,
                         'interface': network['iface'],
-                        'source': juju_context("principal_unit"),
-                        'source_hostname': PRINCIPAL_HOSTNAME,
-                        'destination': rel_data['principal-unit'],
-                        'destination_hostname': rel_data['principal-hostname'],
-                        'source_az': juju_context("availability_zone"),
-                        'destination_az': rel_data['az'],
-                        'probe': 'icmp'
-                    }
+                        **destination_labels,
+                    },
                 }
-                )
+                for network in unit_networks
+            )
 
+        scrape_job["static_configs"] = static_configs
         scrape_job['relabel_configs'] = self._relabel_configs
 
         return scrape_job
 
+    @functools.cached_property
     def _self_metrics(self) -> Dict[str, Any]:
-        """Return the self-monitoring scrape job.
+        """Return the self-monitoring scrape job, built at most once per hook.
 
         It is expected that the scraping of this BE's self workload metrics
         will be done by an Otelcol that is on the same machine as
@@ -344,24 +549,41 @@ class BlackboxExporterOperatorCharm(ops.CharmBase):
 
     def _custom_scrape_jobs(self, probes_file: str) -> List[Dict[str, Any]]:
         """Validate and return a list of custom jobs."""
+        from pydantic import ValidationError
+
         try:
-            probes_yaml = yaml.safe_load(probes_file)
+            probes_yaml = _load_yaml(probes_file)
         except Exception as e:
             logger.warning(
                 "An error has occurred while validating the probes file using YAML %s", e
                 )
-            self._stored.status["probes_file"] = to_tuple(
-                BlockedStatus("Error when validating probes file; see debug-log")
-                )
-            return []
-        try:
-            ProbesFile(**probes_yaml)
-        except ValidationError as e:
-            logger.warning("An error has occurred while validating the probes file %s", e)
-            self._stored.status["probes_file"] = to_tuple(
-                BlockedStatus("Invalid probes file; see debug-log")
+            self._set_status(
+                "probes_file", BlockedStatus("Error when validating probes file; see debug-log")
             )
             return []
+        # Skip the pydantic walk when this exact probes file already validated
+        # successfully on a previous hook.
+        probes_hash = _content_hash(probes_file)
+        if probes_hash != self._stored.probes_hash:
+            # Cheap shape check first, mirroring _push_config: most malformed
+            # probes files fail here without a full pydantic walk.
+            if not isinstance(probes_yaml, dict) or not isinstance(
+                probes_yaml.get("scrape_configs"), list
+            ):
+                logger.warning("Invalid probes file: no top-level 'scrape_configs' list")
+                self._set_status(
+                    "probes_file", BlockedStatus("Invalid probes file; see debug-log")
+                )
+                return []
+            try:
+                _probes_adapter().validate_python(probes_yaml)
+            except ValidationError as e:
+                logger.warning("An error has occurred while validating the probes file %s", e)
+                self._set_status(
+                    "probes_file", BlockedStatus("Invalid probes file; see debug-log")
+                )
+                return []
+            self._stored.probes_hash = probes_hash
         extra_labels = {
             'source': juju_context("principal_unit"),
             'source_hostname': PRINCIPAL_HOSTNAME,
@@ -370,16 +592,14 @@ class BlackboxExporterOperatorCharm(ops.CharmBase):
         for job in custom_jobs:
             # Prepend the principal hostname to job_name
             job["job_name"] = f"{PRINCIPAL_HOSTNAME}-{job['job_name']}"
+            job["relabel_configs"] = self._relabel_configs
 
             # Add the source (principal_unit) and source hostname labels.
             # This will overwrite the value for these keys if they are provided.
             for static_config in job.get("static_configs", []):
-                if "labels" not in static_config:
-                    static_config["labels"] = {}
-                static_config["labels"].update(extra_labels)
-                job['relabel_configs'] = self._relabel_configs
+                static_config["labels"] = {**static_config.get("labels", {}), **extra_labels}
         logger.info("Custom scraped jobs have been validated and sanitized.")
-        self._stored.status["probes_file"] = to_tuple(ActiveStatus())
+        self._set_status("probes_file", ActiveStatus())
         return custom_jobs
 
     @property
@@ -387,7 +607,7 @@ class BlackboxExporterOperatorCharm(ops.CharmBase):
         """Generate all scrape jobs defined by charm, to be scraped by a scraper.
 
         `All` scrape jobs consist of three different jobs:
-        1. This charm's own self metrics monitoring. Returned by self._self_metrics()
+        1. This charm's own self metrics monitoring. Returned by self._self_metrics
         2. Scrape jobs that test connectivity between the machines hosting
             this BE charm and its peers. Returned by self._connectivity_scrape_jobs.
             These jobs will only be generated if
@@ -398,46 +618,64 @@ class BlackboxExporterOperatorCharm(ops.CharmBase):
         3. Any scrape jobs provided by the user via the `probes_file`
           config option. These jobs will be validated and sanitized by self._custom_scrape_jobs.
         """
+        peer_relation = self._peer_relation
+        probes_file = cast(str, self.model.config.get("probes_file"))
+
+        # Peer databags cannot change within a hook, so the job list is fully
+        # determined by the peer set and the probes_file option; reuse the
+        # list built earlier in this hook when neither has changed.
+        cache_key = (
+            tuple(sorted(unit.name for unit in peer_relation.units)) if peer_relation else None,
+            probes_file,
+        )
+        if cache_key == self._jobs_cache_key and self._jobs_cache_val is not None:
+            return self._jobs_cache_val
+
         all_scrape_jobs = []
 
         # Add self monitoring scrape jobs.
-        all_scrape_jobs.append(self._self_metrics())
+        all_scrape_jobs.append(self._self_metrics)
 
         # If there is more than 1 peer for this charm
         # AND automatic connectivity checks are enabled (config option to be added)
         # generate connectivity scrape jobs.
-        peer_relation = self.model.get_relation(PEERS_RELATION_NAME)
-
         if peer_relation: # TODO AND auto connectivity checks enabled
             all_scrape_jobs.append(
                 self._connectivity_scrape_jobs(peer_relation)
                 )
 
-        probes_file = cast(str, self.model.config.get("probes_file"))
         if probes_file:
             # all_scrape_jobs returns a list of jobs so we extend.
             all_scrape_jobs.extend(
                 self._custom_scrape_jobs(probes_file)
             )
 
+        self._jobs_cache_key = cache_key
+        self._jobs_cache_val = all_scrape_jobs
         return all_scrape_jobs
 
-    @property
+    @functools.cached_property
     def _machine_ip(self) -> str:
         """Return the bind address used for Juju for this machine.
 
         This is safe, even on a machine with multiple interfaces.
+        Cached per charm instance: the binding cannot change within a hook,
+        and resolving it goes through a hook tool.
         """
         binding = self.model.get_binding("juju-info")
         assert binding is not None
         return str(binding.network.bind_address)
 
+    @functools.cached_property
+    def _unit_networks(self):
+        """Return this machine's networks, scanned once per hook invocation."""
+        return get_unit_networks()
+
     @property
     def _relabel_configs(self) -> List[Dict]:
         """Return the relabel configs necessary for scrape jobs."""
         return [
-                {'source_labels': ['__address__'], 'target_label': '__param_target'},
-                {'source_labels': ['__param_target'], 'target_label': 'instance'},
+                *_BASE_RELABEL_CONFIGS,
                 {'target_label': '__address__', 'replacement': self._machine_ip+':9115'}
             ]
 
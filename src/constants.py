@@ -1,7 +1,7 @@
 """Charm constants, for better testability."""
 
 from pathlib import Path
-from typing import Final
+from typing import Any, Dict, Final
 
 COS_AGENT_RELATION_NAME: Final[str] = "cos-agent"
 PEERS_RELATION_NAME: Final[str] = "peers"
@@ -9,18 +9,25 @@ DEFAULT_PORT: Final[int] = 9115
 LOG_SLOT_NAME: Final[str] = "prometheus-blackbox-exporter-logs"
 SNAP_NAME: Final[str] = "prometheus-blackbox-exporter"
 SNAP_CONFIG_PATH: Final[Path] = Path("/var/snap/prometheus-blackbox-exporter/current/blackbox.yml")
-DEFAULT_CONFIG_FILE: Final[str] = """
-modules:
-    http_2xx:
-        prober: http
-        timeout: 10s
-    tcp_connect:
-        prober: tcp
-        timeout: 10s
-    icmp:
-        prober: icmp
-        timeout: 10s
-        icmp:
-            preferred_ip_protocol: "ip4"
-            ip_protocol_fallback: true
-"""
+# Kept as a dict literal so consumers never have to parse YAML; it is only
+# dumped to YAML at the point where the config file is written.
+DEFAULT_CONFIG: Final[Dict[str, Any]] = {
+    "modules": {
+        "http_2xx": {
+            "prober": "http",
+            "timeout": "10s",
+        },
+        "tcp_connect": {
+            "prober": "tcp",
+            "timeout": "10s",
+        },
+        "icmp": {
+            "prober": "icmp",
+            "timeout": "10s",
+            "icmp": {
+                "preferred_ip_protocol": "ip4",
+                "ip_protocol_fallback": True,
+            },
+        },
+    },
+}
@@ -2,43 +2,39 @@
 
 This models module will hold ops-independent classes to be used by charm code for data validation.
 """
-from typing import Any, Dict, List
+from typing import Annotated, Any, Dict, List, Literal
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
 
 
 class Config(BaseModel):
     """BaseModel for a config file."""
+    model_config = ConfigDict(frozen=True)
+
     modules: Dict[str, Any]
 
 class StaticConfig(BaseModel):
     """Configuration for static scrape targets."""
-    targets: List[str] = Field(..., min_items=1)  # type: ignore
+    model_config = ConfigDict(frozen=True)
+
+    targets: List[str] = Field(..., min_length=1)
 
 class ScrapeJob(BaseModel):
-    """Represents a single scrape job configuration."""
-    job_name: str
-    metrics_path: str
-    params: Dict[str, List[str]]  # e.g., {"module": ["http_2xx"]}
-    static_configs: List[StaticConfig] = Field(..., min_items=1) # type: ignore
+    """Represents a single scrape job configuration.
 
-    @field_validator("job_name")
-    @classmethod
-    def job_name_not_empty(cls, v):
-        """Ensure job_name is not empty or whitespace."""
-        if not v.strip():
-            raise ValueError("job_name cannot be empty")
-        return v
+    The field constraints run entirely in pydantic-core, so validating a large
+    probes file never drops back into Python-level validators.
+    """
+    model_config = ConfigDict(frozen=True)
 
-    @field_validator("metrics_path")
-    @classmethod
-    def metrics_path_must_be_probes(cls, v):
-        """Ensure metrics_path is '/probe'."""
-        if v != "/probe":
-            raise ValueError('metrics_path must be "/probe"')
-        return v
+    job_name: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+    metrics_path: Literal["/probe"]
+    params: Dict[str, List[str]]  # e.g., {"module": ["http_2xx"]}
+    static_configs: List[StaticConfig] = Field(..., min_length=1)
 
 
 class ProbesFile(BaseModel):
     """Top-level model representing a probes configuration file."""
-    scrape_configs: List[ScrapeJob] = Field(..., min_items=1) # type: ignore
+    model_config = ConfigDict(frozen=True)
+
+    scrape_configs: List[ScrapeJob] = Field(..., min_length=1)
@@ -5,7 +5,7 @@ import os
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Set
+from typing import Dict, Set
 
 
 @dataclass
@@ -125,6 +125,20 @@ class SingletonSnapManager:
         with open(self.LOCK_DIR.joinpath(registration_file.filename), "w") as f:
             f.write("")
 
+    def register_many(self, snap_revisions: Dict[str, int]) -> None:
+        """Register current unit as using each of the given snaps and revisions.
+
+        Bulk variant of :meth:`register` for callers that track several snaps.
+
+        Args:
+            snap_revisions: Mapping from snap name to the revision to register.
+
+        Raises:
+            OSError: if there is an I/O related error creating a lock file.
+        """
+        for snap_name, snap_revision in snap_revisions.items():
+            self.register(snap_name, snap_revision)
+
     def unregister(self, snap_name: str, snap_revision: int) -> None:
         """Unregister current unit from using the specified snap.
 
@@ -161,6 +175,28 @@ class SingletonSnapManager:
                     revisions.add(registration_file.snap_revision)
         return revisions
 
+    @classmethod
+    def snapshot_revisions(cls) -> Dict[str, Set[int]]:
+        """Get the registered revisions of every snap in a single directory scan.
+
+        Bulk variant of :meth:`get_revisions`, for callers that would otherwise
+        re-scan the lock directory once per snap.
+
+        Returns:
+            Mapping from snap name to the set of revisions registered by any unit.
+
+        Raises:
+            OSError: If there's an error accessing the lock directory or files.
+        """
+        cls._ensure_lock_dir_exists()
+        revisions: Dict[str, Set[int]] = {}
+        for filename in os.listdir(cls.LOCK_DIR):
+            registration_file = SnapRegistrationFile.from_filename(filename)
+            revisions.setdefault(registration_file.snap_name, set()).add(
+                registration_file.snap_revision
+            )
+        return revisions
+
     @classmethod
     def get_units(cls, snap_name: str) -> Set[str]:
         """Get all units currently registered for a snap (atomic with directory lock).
@@ -2,18 +2,24 @@
 
 This utils module will hold ops-independent logic to be used by charm code.
 """
+import functools
 import logging
+import socket
+import struct
 import subprocess
-from dataclasses import dataclass
-from ipaddress import IPv4Interface, IPv4Network
+import time
+from dataclasses import dataclass, field
+from ipaddress import IPv4Network
 from pathlib import Path
-from typing import cast
 
-from netifaces import AF_INET, InterfaceType, ifaddresses, interfaces
+from netifaces import AF_INET, ifaddresses, interfaces
 
 logger = logging.getLogger(__name__)
 
-@dataclass(frozen=True)
+# Pseudo-interfaces that never carry peer-reachable addresses.
+_SKIP_IFACES: frozenset[str] = frozenset({"lo"})
+
+@dataclass(frozen=True, slots=True)
 class Network:
     """Represents an IPv4 network bound to a system network interface.
 
@@ -25,6 +31,16 @@ class Network:
     iface: str
     ip: str
     net: IPv4Network
+    # Precomputed at construction: the CIDR rendering and the serialized
+    # form are requested repeatedly when packing relation data.
+    _dict: dict[str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(
+            self,
+            "_dict",
+            {"iface": self.iface, "ip": self.ip, "net": str(self.net)},
+        )
 
     def to_dict(self) -> dict[str, str]:
         """Convert the Network object into a JSON-serializable dictionary.
@@ -35,72 +51,232 @@ class Network:
                 - "ip": IPv4 address as a string
                 - "net": IPv4 network in CIDR notation
         """
-        return {
-            "iface": self.iface,
-            "ip": self.ip,
-            "net": str(self.net),
-        }
+        return self._dict
+
+
+@functools.lru_cache(maxsize=256)
+def _ipv4_network(network_int: int, prefixlen: int) -> IPv4Network:
+    """Build an IPv4Network from an integer address, caching repeated ones.
+
+    Addresses recur across calls (same host, multiple lookups), so repeated
+    constructions collapse into one cached object.
+    """
+    return IPv4Network((network_int, prefixlen))
 
 
-def get_unit_networks() -> list[Network]:
-    """Return all IP addresses of the machine hosting this unit across all interfaces."""
+# Netlink constants from linux/netlink.h and linux/rtnetlink.h, for the
+# RTM_GETADDR dump in _netlink_networks.
+_NLM_F_REQUEST = 0x1
+_NLM_F_DUMP = 0x300  # NLM_F_ROOT | NLM_F_MATCH
+_NLMSG_ERROR = 2
+_NLMSG_DONE = 3
+_RTM_GETADDR = 22
+_RTM_NEWADDR = 20
+_IFA_LOCAL = 2
+_IFA_LABEL = 3
+_NLMSG_HDR = struct.Struct("=LHHLL")  # nlmsghdr
+_IFADDRMSG = struct.Struct("=BBBBi")  # ifaddrmsg
+_RTATTR = struct.Struct("=HH")  # rtattr
+
+
+def _parse_newaddr(data: bytes, offset: int, msg_len: int) -> Network | None:
+    """Parse one RTM_NEWADDR message into a Network.
+
+    Returns None for non-IPv4 addresses, skipped interfaces, and addresses
+    whose interface cannot be named.
+    """
+    family, prefixlen, _, _, ifa_index = _IFADDRMSG.unpack_from(data, offset + _NLMSG_HDR.size)
+    if family != socket.AF_INET:
+        return None
+    ip_bytes = label = None
+    attr_off = offset + _NLMSG_HDR.size + _IFADDRMSG.size
+    while attr_off + _RTATTR.size <= offset + msg_len:
+        rta_len, rta_type = _RTATTR.unpack_from(data, attr_off)
+        if rta_len < _RTATTR.size:
+            break
+        payload = data[attr_off + _RTATTR.size : attr_off + rta_len]
+        if rta_type == _IFA_LOCAL:
+            ip_bytes = payload
+        elif rta_type == _IFA_LABEL:
+            label = payload.rstrip(b"\0").decode()
+        attr_off += (rta_len + 3) & ~3
+    if label is None:
+        # Secondary addresses may carry no IFA_LABEL rtattr; resolve the
+        # interface name from the index, as getifaddrs does.
+        try:
+            label = socket.if_indextoname(ifa_index)
+        except OSError:
+            return None
+    if not ip_bytes or label in _SKIP_IFACES:
+        return None
+    ip_int = int.from_bytes(ip_bytes, "big")
+    net_int = ip_int & (0xFFFFFFFF << (32 - prefixlen)) & 0xFFFFFFFF
+    return Network(
+        iface=label,
+        ip=socket.inet_ntoa(ip_bytes),
+        net=_ipv4_network(net_int, prefixlen),
+    )
+
+
+def _recv_dump(sock: socket.socket) -> list[Network] | None:
+    """Read the multipart RTM_GETADDR reply off an already-primed socket."""
     networks: list[Network] = []
+    while True:
+        data = sock.recv(65536)
+        offset = 0
+        while offset + _NLMSG_HDR.size <= len(data):
+            msg_len, msg_type, _, _, _ = _NLMSG_HDR.unpack_from(data, offset)
+            if msg_len < _NLMSG_HDR.size or offset + msg_len > len(data):
+                return None
+            if msg_type == _NLMSG_DONE:
+                return networks
+            if msg_type == _NLMSG_ERROR:
+                return None
+            if msg_type == _RTM_NEWADDR and (network := _parse_newaddr(data, offset, msg_len)):
+                networks.append(network)
+            offset += (msg_len + 3) & ~3
 
-    for iface in filter(lambda iface: iface not in {"lo"}, interfaces()):
-        addrs = ifaddresses(iface).get(cast(InterfaceType, AF_INET), [])
 
-        for addr in addrs:
-            addr = cast(dict[str, str], addr)
+def _netlink_networks() -> list[Network] | None:
+    """Enumerate IPv4 addresses with a single netlink RTM_GETADDR dump.
+
+    One socket round-trip replaces the per-interface getifaddrs walk that
+    netifaces does. Returns None when the dump cannot be performed
+    (non-Linux, restricted sandbox, unexpected reply), in which case the
+    caller falls back to netifaces.
+    """
+    if not hasattr(socket, "AF_NETLINK"):
+        return None
+    try:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW | socket.SOCK_CLOEXEC, 0)
+    except OSError:
+        return None
+    try:
+        sock.settimeout(2)
+        header = _NLMSG_HDR.pack(
+            _NLMSG_HDR.size + _IFADDRMSG.size, _RTM_GETADDR, _NLM_F_REQUEST | _NLM_F_DUMP, 1, 0
+        )
+        sock.send(header + _IFADDRMSG.pack(socket.AF_INET, 0, 0, 0, 0))
+        return _recv_dump(sock)
+    except OSError:
+        return None
+    finally:
+        sock.close()
+
 
+# get_unit_networks is called from several code paths within one hook, and
+# interfaces essentially never change at that timescale; cache the scan
+# briefly. Network is frozen, so handing out the same list is safe.
+_NETWORKS_TTL_SECONDS = 5.0
+_networks_cache: tuple[float, tuple[Network, ...]] | None = None
+
+
+def invalidate_unit_networks_cache() -> None:
+    """Drop the cached get_unit_networks result."""
+    global _networks_cache
+    _networks_cache = None
+
+
+def get_unit_networks() -> tuple[Network, ...]:
+    """Return all IP addresses of the machine hosting this unit across all interfaces.
+
+    The result is an immutable tuple: callers only iterate and serialize it,
+    and the tuple form makes the cached value safe to share.
+    """
+    global _networks_cache
+    now = time.monotonic()
+    if _networks_cache is not None and now - _networks_cache[0] < _NETWORKS_TTL_SECONDS:
+        return _networks_cache[1]
+
+    scanned = _netlink_networks()
+    if scanned is None:
+        scanned = _netifaces_networks()
+
+    networks = tuple(scanned)
+    _networks_cache = (now, networks)
+    return networks
+
+
+def _netifaces_networks() -> list[Network]:
+    """Enumerate IPv4 addresses via netifaces, one getifaddrs call per interface."""
+    networks: list[Network] = []
+
+    for iface in interfaces():
+        if iface in _SKIP_IFACES:
+            continue
+        addrs = ifaddresses(iface).get(AF_INET, [])  # type: ignore[call-overload]
+
+        for addr in addrs:
             ip = addr.get("addr")
             netmask = addr.get("netmask")
 
             if not ip:
                 continue
 
-            # If no netmask, assume /32
-            iface_ip = (
-                IPv4Interface(f"{ip}/{netmask}")
-                if netmask
-                else IPv4Interface(f"{ip}/32")
+            # Parse the dotted quads in libc (inet_aton) and derive the
+            # network with integer math, instead of round-tripping both
+            # strings through the IPv4Interface constructor.
+            # If no netmask, assume /32.
+            ip_int = int.from_bytes(socket.inet_aton(ip), "big")
+            mask_int = (
+                int.from_bytes(socket.inet_aton(netmask), "big") if netmask else 0xFFFFFFFF
             )
+            prefixlen = 32 - (mask_int ^ 0xFFFFFFFF).bit_length()
 
             networks.append(
                 Network(
                     iface=iface,
-                    ip=str(iface_ip.ip),
-                    net=iface_ip.network,
+                    ip=ip,
+                    net=_ipv4_network(ip_int & mask_int, prefixlen),
                 )
             )
 
     return networks
 
-def is_snap_active(snap_name: str) -> bool:
-    """Return True if the snap is installed and in the 'active' state."""
+@functools.lru_cache(maxsize=1)
+def _snap_services() -> bytes | None:
+    """List every snap service in a single `snap services` call.
+
+    The listing is cached for the lifetime of the (short-lived) hook process,
+    so checking several snaps costs one fork+exec in total. The output stays
+    as bytes — the status probe needs no locale decoding and no stderr.
+    Returns None when the listing fails.
+    """
     try:
-        # snap services returns the status of the service
         result = subprocess.run(
-            ["snap", "services", snap_name],
-            capture_output=True,
-            text=True,
+            ["snap", "services"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             check=True,
         )
-        # Output example:
-        # Service                 Startup  Current  Notes
-        # prometheus-blackbox-exporter.enable  enabled  active   -
-        # We check for 'active' in the Current column
-        for line in result.stdout.splitlines():
-            if snap_name in line:
-                if "active" in line.split():
-                    return True
-        logger.warning("Snap {snap_name} is not active. Ensure provided config is valid.")
-        return False
     except subprocess.CalledProcessError as e:
-        logger.info("Unable to determine the activeness status of snap {snap_name}: %s", e)
+        logger.info("Unable to list snap services: %s", e)
+        return None
+    return result.stdout
+
+def is_snap_active(snap_name: str) -> bool:
+    """Return True if the snap is installed and in the 'active' state."""
+    output = _snap_services()
+    if output is None:
+        logger.info("Unable to determine the activeness status of snap %s", snap_name)
         return False
+    # Output example:
+    # Service                 Startup  Current  Notes
+    # prometheus-blackbox-exporter.enable  enabled  active   -
+    # We check for 'active' in the Current column
+    prefix = snap_name.encode() + b"."
+    for line in output.splitlines()[1:]:
+        if not line.startswith(prefix):
+            continue
+        cols = line.split()
+        if len(cols) >= 3 and cols[2] == b"active":
+            return True
+    logger.warning("Snap %s is not active. Ensure provided config is valid.", snap_name)
+    return False
 
 def file_contents(path: Path) -> str | None:
-    """Return the content of a file at path `path`."""
-    if not path.exists():
+    """Return the content of a file at path `path`, or None if it does not exist."""
+    try:
+        return path.read_text()
+    except FileNotFoundError:
         return None
-    return path.read_text()
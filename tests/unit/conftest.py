@@ -7,9 +7,28 @@ from unittest.mock import patch
 import pytest
 from scenario import Context
 
+import charm
+import src.utils
+import utils
 from charm import BlackboxExporterOperatorCharm
 
 
+@pytest.fixture(autouse=True)
+def clear_juju_context_cache():
+    # The Juju env is parsed once per process in production, but each scenario
+    # run simulates a fresh hook invocation with different env variables.
+    charm._ctx.cache_clear()
+    yield
+
+@pytest.fixture(autouse=True)
+def clear_unit_networks_cache():
+    # utils is imported both as `utils` (by charm code) and as `src.utils`
+    # (by the network tests), so each module object carries its own cache.
+    utils.invalidate_unit_networks_cache()
+    src.utils.invalidate_unit_networks_cache()
+    yield
+
+
 @pytest.fixture
 def placeholder_cfg_path(tmp_path):
     return tmp_path / "blackbox.yml"
@@ -19,21 +38,24 @@ def mock_config_path(placeholder_cfg_path):
     with patch("charm.SNAP_CONFIG_PATH", placeholder_cfg_path):
         yield
 
-@pytest.fixture(autouse=True)
-def mock_hostname():
-    with patch("socket.gethostname", return_value="hostname"):
-        yield
-
-@pytest.fixture(autouse=True)
-def mock_is_snap_active():
-    with patch("charm.is_snap_active", return_value=True) as mock:
-        yield mock
-
-@pytest.fixture
+@pytest.fixture(scope="session", autouse=True)
+def mock_host_environment():
+    # These stubs are constant for the whole suite, so one setattr replaces
+    # a per-test mock enter/exit pair for each of them.
+    mp = pytest.MonkeyPatch()
+    mp.setattr("socket.gethostname", lambda: "hostname")
+    mp.setattr("charm.is_snap_active", lambda *_: True)
+    yield
+    mp.undo()
+
+@pytest.fixture(scope="session")
 def be_charm():
     return BlackboxExporterOperatorCharm
 
 
-@pytest.fixture(scope="function")
+# No test mutates the Context object itself (they only emit events through
+# it), so one instance for the whole session is safe and pays the charm
+# metadata parsing exactly once.
+@pytest.fixture(scope="session")
 def context(be_charm):
     return Context(charm_type=be_charm)
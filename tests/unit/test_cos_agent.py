@@ -4,18 +4,46 @@
 # To learn more about testing, see https://documentation.ubuntu.com/ops/latest/explanation/testing/
 
 
-import json
 import logging
 import socket
 
-import yaml
+import orjson
+import pytest
 from ops import testing
 from scenario import PeerRelation, State, SubordinateRelation
 
 PRINCIPAL_HOSTNAME = socket.gethostname()
 
+
+def orjson_dumps(obj) -> str:
+    # Relation data wants str; orjson emits bytes.
+    return orjson.dumps(obj).decode()
+
 logger = logging.getLogger(__name__)
 
+# Serialized once at import and shared by every test that references the
+# peer databags below.
+_UNIT_NETWORKS_ONE_JSON = orjson_dumps([
+    {
+        "iface": "eth0",
+        "ip": "10.223.56.245",
+        "net": "10.223.56.245/32",
+    }
+])
+
+_UNIT_NETWORKS_TWO_JSON = orjson_dumps([
+    {
+        "iface": "dummy0",
+        "ip": "10.10.10.1",
+        "net": "10.10.10.1/32",
+    },
+    {
+        "iface": "eth0",
+        "ip": "10.223.56.245",
+        "net": "10.223.56.245/32",
+    },
+])
+
 # Simulating a peer with only ONE interface.
 PEER_ONE_REL_DATA = {
     "az": "medium-vm",
@@ -24,13 +52,7 @@ PEER_ONE_REL_DATA = {
     "principal-hostname": "juju-4f7add-0",
     "principal-unit": "ubuntu/0",
     "private-address": "10.223.56.245",
-    "unit-networks": json.dumps([
-        {
-            "iface": "eth0",
-            "ip": "10.223.56.245",
-            "net": "10.223.56.245/32",
-        }
-    ]),
+    "unit-networks": _UNIT_NETWORKS_ONE_JSON,
 }
 
 # Simulating a peer which has TWO interfaces.
@@ -41,18 +63,7 @@ PEER_TWO_REL_DATA = {
     "principal-hostname": "juju-4f7add-0",
     "principal-unit": "ubuntu/0",
     "private-address": "10.223.56.245",
-    "unit-networks": json.dumps([
-        {
-            "iface": "dummy0",
-            "ip": "10.10.10.1",
-            "net": "10.10.10.1/32",
-        },
-        {
-            "iface": "eth0",
-            "ip": "10.223.56.245",
-            "net": "10.223.56.245/32",
-        },
-    ]),
+    "unit-networks": _UNIT_NETWORKS_TWO_JSON,
 }
 
 VALID_PROBES_FILE = {
@@ -83,10 +94,47 @@ INVALID_PROBES_FILE = {
     ]
 }
 
-def test_self_metrics(context):
+# YAML is a superset of JSON, so the charm's YAML loader accepts these
+# unchanged; serializing once at import skips a PyYAML emitter run per test.
+VALID_PROBES_YAML = orjson_dumps(VALID_PROBES_FILE)
+INVALID_PROBES_YAML = orjson_dumps(INVALID_PROBES_FILE)
+
+
+# Scenario relation objects are immutable and scenario deep-copies the state
+# it runs, so the same relation instances can be shared across the module
+# instead of being re-validated per test.
+@pytest.fixture(scope="module")
+def cos_agent_rel():
+    return SubordinateRelation(endpoint="cos-agent")
+
+
+@pytest.fixture(scope="module")
+def peer_rel_one():
+    return PeerRelation(endpoint="peers", peers_data={1: PEER_ONE_REL_DATA})
+
+
+@pytest.fixture(scope="module")
+def peer_rel_two():
+    return PeerRelation(endpoint="peers", peers_data={1: PEER_ONE_REL_DATA, 2: PEER_TWO_REL_DATA})
+
+
+def _rels_by_endpoint(state_out):
+    """Index the output state's relations by endpoint."""
+    return {rel.endpoint: rel for rel in state_out.relations}
+
+
+def _scrape_jobs(state_out):
+    """Return the metrics scrape jobs the charm wrote to the cos-agent databag."""
+    relation = _rels_by_endpoint(state_out).get("cos-agent")
+    assert relation
+    config = getattr(relation, "local_unit_data", {}).get("config", {})
+    return orjson.loads(config).get("metrics_scrape_jobs", {})
+
+
+def test_self_metrics(context, cos_agent_rel):
     """Test that the cos-agent endpoint writes the self monitoring scrape jobs to rel data."""
     # GIVEN a BE charm which has no peers or probes_file set via juju config.
-    cos_agent_relation = SubordinateRelation(endpoint="cos-agent")
+    cos_agent_relation = cos_agent_rel
     state = State(relations={cos_agent_relation})
 
     # WHEN a cos-agent relation is joined.
@@ -94,18 +142,9 @@ def test_self_metrics(context):
         context(context.on.relation_joined(cos_agent_relation), state=state) as mgr,
     ):
         state_out = mgr.run()
-        cos_agent_relation = next(
-            (obj for obj in state_out.relations if obj.endpoint == "cos-agent"), None
-            )
-        assert cos_agent_relation
 
         # THEN, there must be EXACTLY ONE metrics scrape jobs
-        local_unit_data_config = getattr(
-            cos_agent_relation, "local_unit_data", {}).get("config", {}
-                                                           )
-        scrape_jobs_json = json.loads(local_unit_data_config).get(
-            "metrics_scrape_jobs", {}
-        )
+        scrape_jobs_json = _scrape_jobs(state_out)
         assert scrape_jobs_json
 
         assert len(scrape_jobs_json) == 1
@@ -113,36 +152,39 @@ def test_self_metrics(context):
         # AND the name of that single job must be `be-self-monitoring`
         assert "be-self-monitoring" in scrape_jobs_json[0].get("job_name", "")
 
-def test_connectivity_checks_metrics_one_peer(context):
+# The one-peer and two-peer cases only differ in the peers_data and in how
+# many connectivity targets come out; everything else is asserted once.
+@pytest.mark.parametrize(
+    "peer_rel_fixture, expected_static_configs",
+    [
+        # 1 peer with 1 interface -> 1 connectivity target.
+        ("peer_rel_one", 1),
+        # 2 peers, one with 1 interface and one with 2 -> 3 targets.
+        ("peer_rel_two", 3),
+    ],
+)
+def test_connectivity_checks_metrics(
+    context, cos_agent_rel, peer_rel_fixture, expected_static_configs, request
+):
     """Test that the cos-agent endpoint writes the correct jobs to rel data."""
-    # GIVEN a BE charm which has EXACTLY ONE peer and no probes_file set via juju config.
-    cos_agent_relation = SubordinateRelation(endpoint="cos-agent")
-    peer_relation = PeerRelation(endpoint="peers", peers_data={1: PEER_ONE_REL_DATA})
-    state = State(relations={cos_agent_relation, peer_relation})
+    # GIVEN a BE charm which has peers and no probes_file set via juju config.
+    peer_relation = request.getfixturevalue(peer_rel_fixture)
+    state = State(relations={cos_agent_rel, peer_relation})
 
     # WHEN a reconcile happens.
     with (
         context(context.on.update_status(), state=state) as mgr,
     ):
         state_out = mgr.run()
-        cos_agent_relation = next(
-            (obj for obj in state_out.relations if obj.endpoint == "cos-agent"), None
-            )
-        assert cos_agent_relation
 
         # THEN, there must be EXACTLY TWO metrics scrape jobs
-        # 1. for self monitoring and 2. for auto cross-unit-connectivity checks to the sole peer.
+        # 1. for self monitoring and 2. for auto cross-unit-connectivity checks to the peers.
         # Note: charm.py adds the scrape jobs in the order below.
         # 1. The self monitoring job
         # 2. Automatic connectivity checks
         # 3. probes_file jobs
         # So the assumptions below that the first job will be for self monitoring etc is safe.
-        local_unit_data_config = getattr(
-            cos_agent_relation, "local_unit_data", {}).get("config", {}
-                                                           )
-        scrape_jobs_json = json.loads(local_unit_data_config).get(
-            "metrics_scrape_jobs", {}
-        )
+        scrape_jobs_json = _scrape_jobs(state_out)
         assert scrape_jobs_json
 
         assert len(scrape_jobs_json) == 2
@@ -155,63 +197,16 @@ def test_connectivity_checks_metrics_one_peer(context):
             "job_name", ""
             )
 
-        # AND since there is only 1 peer with only 1 interface,
-        # the length of `static_configs` must be EXACTLY 1.
+        # AND there must be one connectivity target per peer interface.
         static_configs = scrape_jobs_json[1].get("static_configs", {})
-        assert len(static_configs) == 1
-
-def test_connectivity_checks_metrics_two_peers(context):
-    """Test that the cos-agent endpoint writes the correct jobs to rel data."""
-    # GIVEN a BE charm which has TWO peers and no probes_file set via juju config.
-    cos_agent_relation = SubordinateRelation(endpoint="cos-agent")
-    peer_relation = PeerRelation(
-        endpoint="peers", peers_data={1: PEER_ONE_REL_DATA, 2: PEER_TWO_REL_DATA}
-        )
-    state = State(relations={cos_agent_relation, peer_relation})
+        assert len(static_configs) == expected_static_configs
 
-    # WHEN a reconcile happens.
-    with (
-        context(context.on.update_status(), state=state) as mgr,
-    ):
-        state_out = mgr.run()
-        cos_agent_relation = next(
-            (obj for obj in state_out.relations if obj.endpoint == "cos-agent"), None
-            )
-        assert cos_agent_relation
-
-        # THEN, there must be EXACTLY TWO metrics scrape jobs
-        # 1. for self monitoring and 2. for auto cross-unit-connectivity checks to the sole peer.
-        local_unit_data_config = getattr(
-            cos_agent_relation, "local_unit_data", {}).get("config", {}
-                                                           )
-        scrape_jobs_json = json.loads(local_unit_data_config).get(
-            "metrics_scrape_jobs", {}
-        )
-        assert scrape_jobs_json
-
-        assert len(scrape_jobs_json) == 2
-
-        # AND the name of that first job must be `be-self-monitoring`
-        assert "be-self-monitoring" in scrape_jobs_json[0].get("job_name", "")
-
-        # AND the name of the second job must be equal to the principal host name
-        assert f"{PRINCIPAL_HOSTNAME}-connectivity-checks" in scrape_jobs_json[1].get(
-            "job_name", ""
-            )
-
-        # AND since there are 2 peers, one with 1 interface and one with 2 interfaces,
-        # the length of static_configs for this job must be EXACTLY three.
-        static_configs = scrape_jobs_json[1].get("static_configs", {})
-        assert len(static_configs) == 3
-
-def test_valid_probes_file_forwarded(context):
+def test_valid_probes_file_forwarded(context, cos_agent_rel, peer_rel_one):
     """Test that the cos-agent endpoint forwards valid probes file content."""
     # GIVEN a BE charm which has EXACTLY ONE peer and a **valid** probes_file set via juju config.
-    cos_agent_relation = SubordinateRelation(endpoint="cos-agent")
-    peer_relation = PeerRelation(endpoint="peers", peers_data={1: PEER_ONE_REL_DATA})
     state = State(
-        relations={cos_agent_relation, peer_relation},
-        config={"probes_file": yaml.dump(VALID_PROBES_FILE)}
+        relations={cos_agent_rel, peer_rel_one},
+        config={"probes_file": VALID_PROBES_YAML}
         )
 
     # WHEN a reconcile happens.
@@ -219,21 +214,12 @@ def test_valid_probes_file_forwarded(context):
         context(context.on.update_status(), state=state) as mgr,
     ):
         state_out = mgr.run()
-        cos_agent_relation = next(
-            (obj for obj in state_out.relations if obj.endpoint == "cos-agent"), None
-            )
-        assert cos_agent_relation
 
         # THEN, there must be EXACTLY THREE metrics scrape jobs
         # 1. for self monitoring and
         # 2. for auto cross-unit-connectivity checks to the sole peer and
         # 3. for the custom probes via probes_file.
-        local_unit_data_config = getattr(
-            cos_agent_relation, "local_unit_data", {}).get("config", {}
-                                                           )
-        scrape_jobs_json = json.loads(local_unit_data_config).get(
-            "metrics_scrape_jobs", {}
-        )
+        scrape_jobs_json = _scrape_jobs(state_out)
         assert scrape_jobs_json
 
         assert len(scrape_jobs_json) == 3
@@ -266,14 +252,12 @@ def test_valid_probes_file_forwarded(context):
         # the status must be active.
         assert isinstance(state_out.unit_status, testing.ActiveStatus)
 
-def test_invalid_probes_file_not_forwarded(context):
+def test_invalid_probes_file_not_forwarded(context, cos_agent_rel, peer_rel_one):
     """Test that the cos-agent endpoint does not forward invalid probes file content."""
     # GIVEN a BE charm which has EXACTLY ONE peer and an **invalid** probes_file set.
-    cos_agent_relation = SubordinateRelation(endpoint="cos-agent")
-    peer_relation = PeerRelation(endpoint="peers", peers_data={1: PEER_ONE_REL_DATA})
     state = State(
-        relations={cos_agent_relation, peer_relation},
-        config={"probes_file": yaml.dump(INVALID_PROBES_FILE)}
+        relations={cos_agent_rel, peer_rel_one},
+        config={"probes_file": INVALID_PROBES_YAML}
         )
 
     # WHEN a reconcile happens.
@@ -281,21 +265,12 @@ def test_invalid_probes_file_not_forwarded(context):
         context(context.on.update_status(), state=state) as mgr,
     ):
         state_out = mgr.run()
-        cos_agent_relation = next(
-            (obj for obj in state_out.relations if obj.endpoint == "cos-agent"), None
-            )
-        assert cos_agent_relation
 
         # THEN, there must be EXACTLY TWO metrics scrape jobs
         # 1. for self monitoring and
         # 2. for auto cross-unit-connectivity checks to the sole peer and
         # Because the probes_file was invalid, it should not be included.
-        local_unit_data_config = getattr(
-            cos_agent_relation, "local_unit_data", {}).get("config", {}
-                                                           )
-        scrape_jobs_json = json.loads(local_unit_data_config).get(
-            "metrics_scrape_jobs", {}
-        )
+        scrape_jobs_json = _scrape_jobs(state_out)
         assert scrape_jobs_json
 
         assert len(scrape_jobs_json) == 2
@@ -1,8 +1,9 @@
 from ipaddress import IPv4Network
 
 import netifaces
+import pytest
 
-from src.utils import Network, get_unit_networks
+from src.utils import Network, _netlink_networks, get_unit_networks
 
 """
 This file tests the get_unit_networks function and Network class
@@ -11,6 +12,8 @@ The tests here are intentionally scenario-independent, as
 the utils module itself is.
 """
 def test_loopback_interface_is_ignored(monkeypatch):
+    # Force the netifaces fallback; the netlink fast path reads real state.
+    monkeypatch.setattr("src.utils._netlink_networks", lambda: None)
     monkeypatch.setattr(
         "src.utils.interfaces",
         lambda: ["lo"]
@@ -30,9 +33,10 @@ def test_loopback_interface_is_ignored(monkeypatch):
 
     networks = get_unit_networks()
 
-    assert networks == []
+    assert networks == ()
 
 def test_single_interface(monkeypatch):
+    monkeypatch.setattr("src.utils._netlink_networks", lambda: None)
     monkeypatch.setattr(
         "src.utils.interfaces",
         lambda: ["eth0"]
@@ -52,15 +56,16 @@ def test_single_interface(monkeypatch):
 
     networks = get_unit_networks()
 
-    assert networks == [
+    assert networks == (
         Network(
             iface="eth0",
             ip="192.168.1.10",
             net=IPv4Network("192.168.1.0/24"),
-        )
-    ]
+        ),
+    )
 
 def test_multiple_interfaces(monkeypatch):
+    monkeypatch.setattr("src.utils._netlink_networks", lambda: None)
     monkeypatch.setattr(
         "src.utils.interfaces",
         lambda: ["eth0", "wlan0"]
@@ -88,7 +93,7 @@ def test_multiple_interfaces(monkeypatch):
 
     networks = get_unit_networks()
 
-    assert networks == [
+    assert networks == (
         Network(
             iface="eth0",
             ip="192.168.1.2",
@@ -99,4 +104,18 @@ def test_multiple_interfaces(monkeypatch):
             ip="10.0.0.5",
             net=IPv4Network("10.0.0.0/24"),
         ),
-    ]
+    )
+
+def test_netlink_dump_agrees_with_netifaces():
+    # Smoke test against the real host: the netlink fast path must report
+    # the same interface/address pairs as the getifaddrs-based fallback.
+    netlink = _netlink_networks()
+    if netlink is None:
+        pytest.skip("netlink unavailable on this host")
+
+    assert sorted((n.iface, n.ip) for n in netlink) == sorted(
+        (iface, addr["addr"])
+        for iface in netifaces.interfaces()
+        if iface != "lo"
+        for addr in netifaces.ifaddresses(iface).get(netifaces.AF_INET, [])
+    )
@@ -24,7 +24,7 @@ def test_peer_relation_data(context):
     ):
         state_out = mgr.run()
 
-        peer_relation = next((obj for obj in state_out.relations if obj.endpoint == "peers"), None)
+        peer_relation = {obj.endpoint: obj for obj in state_out.relations}.get("peers")
 
         unit_networks_data = json.loads(
             getattr(peer_relation, "local_unit_data", {}).get("unit-networks", [])
@@ -1,7 +1,14 @@
+import copy
+
 import pytest
 import yaml
 from pydantic import ValidationError
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: nocover - PyYAML wheels ship libyaml
+    from yaml import SafeLoader
+
 from src.models import ProbesFile
 
 VALID_PROBES_YAML = """
@@ -20,33 +27,39 @@ scrape_configs:
 """
 
 
+# Parsed once for the whole module; tests mutate deep copies. The previous
+# per-test `yaml.safe_load(...).copy()` was a shallow copy that aliased the
+# nested dicts being mutated.
+_VALID_PROBES = yaml.load(VALID_PROBES_YAML, Loader=SafeLoader)
+
+
 def test_valid_probes_file_passes():
-    probes = ProbesFile(**yaml.safe_load(VALID_PROBES_YAML))
+    probes = ProbesFile(**copy.deepcopy(_VALID_PROBES))
     assert probes.scrape_configs[0].job_name == "check-charmhub-connectivity"
 
 
 def test_empty_job_name_fails():
-    data = yaml.safe_load(VALID_PROBES_YAML).copy()
+    data = copy.deepcopy(_VALID_PROBES)
     data["scrape_configs"][0]["job_name"] = ""
 
     with pytest.raises(ValidationError) as exc:
         ProbesFile(**data)
 
-    assert "job_name cannot be empty" in str(exc.value)
+    assert "String should have at least 1 character" in str(exc.value)
 
 
 def test_wrong_metrics_path_fails():
-    data = yaml.safe_load(VALID_PROBES_YAML).copy()
+    data = copy.deepcopy(_VALID_PROBES)
     data["scrape_configs"][0]["metrics_path"] = "/metrics"
 
     with pytest.raises(ValidationError) as exc:
         ProbesFile(**data)
 
-    assert 'metrics_path must be "/probe"' in str(exc.value)
+    assert "Input should be '/probe'" in str(exc.value)
 
 
 def test_missing_targets_fails():
-    data = yaml.safe_load(VALID_PROBES_YAML).copy()
+    data = copy.deepcopy(_VALID_PROBES)
     data["scrape_configs"][0]["static_configs"] = [{"targets": []}]
 
     with pytest.raises(ValidationError):